@@ -45,7 +45,9 @@ g_logbook = plotly_logbook(opt.logbook, population_df)
 plotly.io.show(g_logbook)
 
 # %%
-# At the end of the evolution the graph is saved as an html at the path:
+# At the end of the evolution the graph is saved as an html at the path
+# (it is written in the background, wait_for_plots waits until it is saved):
+opt.wait_for_plots()
 print(opt.tracker.graphics_path)
 print(os.listdir(opt.tracker.graphics_path))
 
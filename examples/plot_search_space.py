@@ -45,7 +45,9 @@ g_search_space = plotly_search_space(df, param_names)
 plotly.io.show(g_search_space)
 
 # %%
-# At the end of the evolution the graph is saved as an html at the path:
+# At the end of the evolution the graph is saved as an html at the path
+# (it is written in the background, wait_for_plots waits until it is saved):
+opt.wait_for_plots()
 print(opt.tracker.graphics_path)
 print(os.listdir(opt.tracker.graphics_path))
 
@@ -1,10 +1,10 @@
 from mloptimizer.aux.utils import create_optimization_folder, init_logger
+import csv
 import os
 import shutil
 from datetime import datetime
 import importlib
 import joblib
-import pandas as pd
 
 
 class Tracker:
@@ -40,6 +40,14 @@ class Tracker:
         self.progress_path = None
         self.results_path = None
         self.graphics_path = None
+        # Rows of the progress file of the current generation
+        self.progress_rows = []
+        # Fitness of the individuals evaluated in the current generation
+        self.progress_fitness = []
+        # Logbook written to the logbook file and number of its records already written
+        self._logbook_written = None
+        self._logbook_file = None
+        self._logbook_rows_written = 0
 
         # MLFlow
         self.use_mlflow = use_mlflow
@@ -57,9 +65,9 @@ class Tracker:
             Name of the optimization class.
         """
         # Inform the user that the optimization is starting
-        self.mloptimizer_logger.info(f"Initiating genetic optimization...")
+        self.mloptimizer_logger.info("Initiating genetic optimization...")
         # self.mloptimizer_logger.info("Algorithm: {}".format(type(self).__name__))
-        self.mloptimizer_logger.info(f"Algorithm: {opt_class}")
+        self.mloptimizer_logger.info("Algorithm: %s", opt_class)
 
     def start_checkpoint(self, opt_run_folder_name):
         """
@@ -92,21 +100,24 @@ class Tracker:
         os.mkdir(self.results_path)
         os.mkdir(self.graphics_path)
         os.mkdir(self.progress_path)
+        self._logbook_written = None
+        self._logbook_file = None
+        self._logbook_rows_written = 0
         self.optimization_logger, _ = init_logger(
             os.path.join(self.opt_run_folder, "opt.log")
         )
 
     def log_clfs(self, classifiers_list: list, generation: int, fitness_list: list[int]):
         self.gen = generation
-        for i in range(len(classifiers_list)):
-            self.optimization_logger.info(f"Generation {generation} - Classifier TOP {i}")
-            self.optimization_logger.info(f"Classifier: {classifiers_list[i]}")
-            self.optimization_logger.info(f"Fitness: {fitness_list[i]}")
-            self.optimization_logger.info("Hyperparams: {}".format(str(classifiers_list[i].get_params())))
+        for i, (clf, fitness) in enumerate(zip(classifiers_list, fitness_list)):
+            self.optimization_logger.info("Generation %s - Classifier TOP %s", generation, i)
+            self.optimization_logger.info("Classifier: %s", clf)
+            self.optimization_logger.info("Fitness: %s", fitness)
+            self.optimization_logger.info("Hyperparams: %s", clf.get_params())
         self.gen = generation + 1
 
     def log_evaluation(self, classifier, metrics):
-        self.optimization_logger.info(f"Adding to mlflow...\nClassifier: {classifier}\nMetrics: {metrics}")
+        self.optimization_logger.debug("Adding to mlflow...\nClassifier: %s\nMetrics: %s", classifier, metrics)
 
         if self.use_mlflow:
             with self.mlflow.start_run():
@@ -122,7 +133,7 @@ class Tracker:
         self.opt_run_folder = os.path.dirname(self.opt_run_checkpoint_path)
         self.optimization_logger, _ = init_logger(os.path.join(self.opt_run_folder,
                                                                f"opt_{os.path.basename(checkpoint)}.log"))
-        self.optimization_logger.info("Initiating from checkpoint {}...".format(checkpoint))
+        self.optimization_logger.info("Initiating from checkpoint %s...", checkpoint)
 
         self.results_path = os.path.join(self.opt_run_folder, "results")
         self.graphics_path = os.path.join(self.opt_run_folder, "graphics")
@@ -143,7 +154,21 @@ class Tracker:
         """
         if filename is None:
             filename = os.path.join(self.results_path, 'logbook.csv')
-        pd.DataFrame(logbook).to_csv(filename, index=False)
+        # Only the new records are appended when the same logbook object keeps growing in the same file
+        if (logbook is not self._logbook_written or filename != self._logbook_file
+                or not 0 < self._logbook_rows_written <= len(logbook)):
+            self._logbook_written = logbook
+            self._logbook_file = filename
+            self._logbook_rows_written = 0
+        fieldnames = list(logbook.header or [])
+        if len(logbook) > 0:
+            fieldnames += [key for key in logbook[0] if key not in fieldnames]
+        with open(filename, "a" if self._logbook_rows_written else "w", newline="") as logbook_file:
+            writer = csv.DictWriter(logbook_file, fieldnames=fieldnames, extrasaction="ignore")
+            if not self._logbook_rows_written:
+                writer.writeheader()
+            writer.writerows(logbook[self._logbook_rows_written:])
+        self._logbook_rows_written = len(logbook)
 
     def write_population_file(self, populations, filename=None):
         """
@@ -160,23 +185,50 @@ class Tracker:
                                 ).to_csv(filename, index=False)
 
     def start_progress_file(self, gen: int):
-        progress_gen_path = os.path.join(self.progress_path, "Generation_{}.csv".format(gen))
-        header_progress_gen_file = "i;total;Individual;fitness\n"
-        with open(progress_gen_path, "w") as progress_gen_file:
-            progress_gen_file.write(header_progress_gen_file)
-            progress_gen_file.close()
-        self.optimization_logger.info("Generation: {}".format(gen))
+        """
+        Start the progress file of a generation. The rows are buffered in memory
+        and written at once by :meth:`end_progress_file`.
+
+        Parameters
+        ----------
+        gen : int
+            Generation number.
+        """
+        self.progress_rows = ["i;total;Individual;fitness\n"]
+        self.progress_fitness = []
+        self.optimization_logger.info("Generation: %s", gen)
 
     def append_progress_file(self, gen, c, evaluations_pending, ind_formatted, fit):
-        self.optimization_logger.info(
-            "Fitting individual (informational purpose): gen {} - ind {} of {}".format(
-                gen, c, evaluations_pending
-            )
+        self.optimization_logger.debug(
+            "Fitting individual (informational purpose): gen %s - ind %s of %s",
+            gen, c, evaluations_pending
         )
+        self.progress_fitness.append(fit[0])
+        self.progress_rows.append(
+            "{};{};{};{}\n".format(c,
+                                   evaluations_pending,
+                                   ind_formatted, fit)
+        )
+
+    def end_progress_file(self, gen: int):
+        """
+        Write the buffered rows to the progress file of a generation.
+
+        Parameters
+        ----------
+        gen : int
+            Generation number.
+        """
         progress_gen_path = os.path.join(self.progress_path, "Generation_{}.csv".format(gen))
-        with open(progress_gen_path, "a") as progress_gen_file:
-            progress_gen_file.write(
-                "{};{};{};{}\n".format(c,
-                                       evaluations_pending,
-                                       ind_formatted, fit)
+        with open(progress_gen_path, "w") as progress_gen_file:
+            progress_gen_file.write("".join(self.progress_rows))
+        if self.progress_fitness:
+            self.optimization_logger.info(
+                "Generation %s: %s individuals evaluated, fitness min %s - mean %s - max %s",
+                gen, len(self.progress_fitness), min(self.progress_fitness),
+                sum(self.progress_fitness) / len(self.progress_fitness), max(self.progress_fitness)
             )
+        else:
+            self.optimization_logger.info("Generation %s: 0 individuals evaluated", gen)
+        self.progress_rows = []
+        self.progress_fitness = []
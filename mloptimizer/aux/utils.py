@@ -49,9 +49,9 @@ def create_optimization_folder(folder):
         The path of the folder created.
     """
     if os.path.exists(folder):
-        logging.warning("The folder {} already exists and it will be used".format(folder))
+        logging.warning("The folder %s already exists and it will be used", folder)
     elif os.makedirs(folder, exist_ok=True):
-        logging.info("The folder {} has been created.".format(folder))
+        logging.info("The folder %s has been created.", folder)
     else:
-        logging.error("The folder {} could not be created.".format(folder))
+        logging.error("The folder %s could not be created.", folder)
     return folder
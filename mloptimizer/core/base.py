@@ -1,5 +1,7 @@
+import contextlib
 import os
 import random
+from collections import deque
 import numpy as np
 from sklearn.metrics import accuracy_score
 
@@ -38,6 +40,8 @@ class Optimizer:
         seed for the random functions
     use_parallel : bool
         flag to use parallel processing
+    n_jobs : int
+        number of workers used when use_parallel is True
     use_mlflow : bool
         flag to use mlflow
     """
@@ -46,7 +50,7 @@ class Optimizer:
                  hyperparam_space: HyperparameterSpace = None,
                  eval_function=train_score,
                  fitness_score="accuracy", metrics=None, seed=random.randint(0, 1000000),
-                 use_parallel=False, use_mlflow=False):
+                 use_parallel=False, n_jobs=-1, use_mlflow=False, features_dtype=None):
         """
         Creates object BaseOptimizer.
 
@@ -70,14 +74,24 @@ class Optimizer:
             fitness score to use to evaluate the performance of the classifier
         use_parallel : bool, optional (default=False)
             flag to use parallel processing
+        n_jobs : int, optional (default=-1)
+            number of workers used when use_parallel is True (-1 means all cores)
         use_mlflow : bool, optional (default=False)
             flag to use mlflow
         seed : int, optional (default=0)
             seed for the random functions (deap, models, and splits on evaluations)
+        features_dtype : data-type, optional (default=None)
+            dtype to store the features with when they are a np.ndarray, e.g. np.float32 to halve
+            their memory footprint. None keeps the dtype of the input
         """
         # Model class
         self.estimator_class = estimator_class
-        # Input mandatory variables
+        # Input mandatory variables, np.ndarray are made C-contiguous so estimators do not copy them on each fit.
+        # Other inputs (sparse matrices, dataframes...) are kept as they are
+        if isinstance(features, np.ndarray):
+            features = np.ascontiguousarray(features, dtype=features_dtype)
+        if isinstance(labels, np.ndarray):
+            labels = np.ascontiguousarray(labels)
         self.features = features
         self.labels = labels
         # Input search space hyperparameters
@@ -96,6 +110,7 @@ class Optimizer:
 
         # Parallel
         self.use_parallel = use_parallel
+        self.n_jobs = n_jobs
 
         # mlflow
         self.use_mlflow = use_mlflow
@@ -106,7 +121,7 @@ class Optimizer:
         # Evaluator
         self.individual_utils = IndividualUtils(hyperparam_space=self.hyperparam_space,
                                                 estimator_class=self.estimator_class, mlopt_seed=self.mlopt_seed)
-        self.evaluator = Evaluator(features=features, labels=labels,
+        self.evaluator = Evaluator(features=self.features, labels=self.labels,
                                    eval_function=eval_function, fitness_score=fitness_score,
                                    metrics=metrics, tracker=self.tracker,
                                    individual_utils=self.individual_utils)
@@ -117,7 +132,9 @@ class Optimizer:
 
     def set_mlopt_seed(self, seed):
         """
-        Method to set the seed for the random functions
+        Method to set the seed for the random functions.
+        The global generators are not seeded here but when each optimization starts,
+        so other instances in the same process do not alter the results.
 
         Parameters
         ----------
@@ -125,8 +142,6 @@ class Optimizer:
             seed for the random functions
         """
         self.mlopt_seed = seed
-        random.seed(seed)
-        np.random.seed(seed)
 
     @staticmethod
     def get_subclasses(my_class):
@@ -144,23 +159,39 @@ class Optimizer:
         list
             list of subclasses
         """
-        subclasses = my_class.__subclasses__()
-        if len(subclasses) == 0:
-            return []
-        next_subclasses = []
-        [next_subclasses.extend(Optimizer.get_subclasses(x)) for x in subclasses]
-        return [*subclasses, *next_subclasses]
+        seen = set()
+        subclasses = []
+        queue = deque(my_class.__subclasses__())
+        while queue:
+            subclass = queue.popleft()
+            if subclass in seen:
+                continue
+            seen.add(subclass)
+            subclasses.append(subclass)
+            queue.extend(subclass.__subclasses__())
+        return subclasses
 
     def get_clf(self, individual):
         individual_dict = self.deap_optimizer.individual2dict(individual)
         clf = self.estimator_class(random_state=self.mlopt_seed, **individual_dict)
         return clf
 
+    def wait_for_plots(self):
+        """
+        Method to wait until the graphics of the last optimization are written
+        (they are rendered in the background after optimize_clf returns).
+        """
+        if self.runs:
+            self.runs[-1].wait_for_plots()
+
     def optimize_clf(self, population_size: int = 10, generations: int = 3,
                      cxpb=0.5, mutpb=0.5, tournsize=4, indpb=0.5, n_elites=10,
-                     checkpoint: str = None, opt_run_folder_name: str = None) -> object:
+                     checkpoint: str = None, opt_run_folder_name: str = None, write_every: int = 0) -> object:
         """
         Method to optimize the classifier. It uses the custom_ea_simple method to optimize the classifier.
+        The HTML graphics of the optimization (search_space.html and logbook.html in the graphics folder)
+        are written in the background and may appear after this method returns,
+        call :meth:`wait_for_plots` to wait for them.
 
         Parameters
         ----------
@@ -182,6 +213,8 @@ class Optimizer:
             path to the checkpoint file
         opt_run_folder_name : str, optional (default=None)
             name of the folder where the execution will be saved
+        write_every : int, optional (default=0)
+            write the population and logbook files every `write_every` generations (0 means only at the end)
 
         Returns
         -------
@@ -196,17 +229,23 @@ class Optimizer:
 
         # Creation of deap optimizer
         self.deap_optimizer = DeapOptimizer(hyperparam_space=self.hyperparam_space, seed=self.mlopt_seed,
-                                            use_parallel=self.use_parallel)
+                                            use_parallel=self.use_parallel, n_jobs=self.n_jobs)
         # Creation of genetic algorithm runner
         ga_runner = GeneticAlgorithmRunner(deap_optimizer=self.deap_optimizer,
                                            tracker=self.tracker,
                                            seed=self.mlopt_seed,
                                            evaluator=self.evaluator)
 
-        # Run genetic algorithm
-        population, logbook, hof = ga_runner.run(population_size=population_size, n_generations=generations,
-                                                 cxpb=cxpb, mutation_prob=mutpb, n_elites=n_elites,
-                                                 tournsize=tournsize, indpb=indpb, checkpoint=checkpoint)
+        # Run genetic algorithm (the parallel workers, if any, are shared by all generations)
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(self.deap_optimizer.parallel_map())
+            if self.use_parallel:
+                # Workers attach to the data in shared memory instead of receiving a pickled copy
+                stack.enter_context(self.evaluator.shared_data())
+            population, logbook, hof = ga_runner.run(population_size=population_size, n_generations=generations,
+                                                     cxpb=cxpb, mutation_prob=mutpb, n_elites=n_elites,
+                                                     tournsize=tournsize, indpb=indpb, checkpoint=checkpoint,
+                                                     write_every=write_every)
 
         self.runs.append(ga_runner)
         self.logbook = logbook
@@ -1,7 +1,50 @@
+import contextlib
+import sys
+import uuid
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
 from sklearn.metrics import accuracy_score, balanced_accuracy_score
 from mloptimizer.aux import Tracker
 import numpy as np
 
+# Shared memory blocks created by this process, keyed by block name
+_created_shared_memory = {}
+# Shared memory blocks attached by this process, {run key: {block name: block}}
+_attached_shared_memory = {}
+
+
+def _tracker_pid():
+    return resource_tracker._resource_tracker._pid
+
+
+def _attach_shared_memory(run_key, name, creator_tracker_pid):
+    shm = _created_shared_memory.get(name)
+    if shm is not None:
+        return shm
+    if run_key not in _attached_shared_memory:
+        # Blocks of previous runs are unlinked by their creator, the mappings are released
+        for old_blocks in _attached_shared_memory.values():
+            for old_shm in old_blocks.values():
+                with contextlib.suppress(BufferError):
+                    old_shm.close()
+        _attached_shared_memory.clear()
+        _attached_shared_memory[run_key] = {}
+    blocks = _attached_shared_memory[run_key]
+    shm = blocks.get(name)
+    if shm is None:
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # The block is owned (and unlinked) by the process that created it. Workers usually share
+            # the resource tracker of the creator and the registration is the creator's one, it is only
+            # removed when the worker runs its own tracker
+            worker_tracker_pid = _tracker_pid()
+            if worker_tracker_pid is not None and worker_tracker_pid != creator_tracker_pid:
+                resource_tracker.unregister(shm._name, "shared_memory")
+        blocks[name] = shm
+    return shm
+
 
 def _default_metrics():
     return {
@@ -45,6 +88,54 @@ class Evaluator:
         self.features = features
         self.labels = labels
         self.individual_utils = individual_utils
+        # Shared memory handles of the data, {"attr": (name, shape, dtype)}
+        self._shared_data = {}
+        # Key of the current sharing of the data and pid of the resource tracker of its blocks
+        self._shared_run = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Data in shared memory is not pickled, workers attach to it in __setstate__
+        for attr in self._shared_data:
+            state[attr] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for attr, (name, shape, dtype) in self._shared_data.items():
+            run_key, tracker_pid = self._shared_run
+            shm = _attach_shared_memory(run_key, name, tracker_pid)
+            setattr(self, attr, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+    @contextmanager
+    def shared_data(self):
+        """
+        Context manager that copies the features and labels into shared memory blocks.
+        While it is active, pickled copies of the evaluator (e.g. sent to parallel workers)
+        only carry the handles of the blocks and the workers attach to the same memory.
+        Data with python objects (dtype=object) or not stored as np.ndarray is pickled as usual.
+        """
+        blocks = []
+        try:
+            self._shared_run = (uuid.uuid4().hex, None)
+            for attr in ("features", "labels"):
+                data = getattr(self, attr)
+                if not isinstance(data, np.ndarray) or data.dtype.hasobject or data.nbytes == 0:
+                    continue
+                shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+                blocks.append(shm)
+                _created_shared_memory[shm.name] = shm
+                self._shared_run = (self._shared_run[0], _tracker_pid())
+                np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[...] = data
+                self._shared_data[attr] = (shm.name, data.shape, data.dtype)
+            yield
+        finally:
+            self._shared_data = {}
+            self._shared_run = None
+            for shm in blocks:
+                _created_shared_memory.pop(shm.name, None)
+                shm.close()
+                shm.unlink()
 
     def evaluate(self, clf, features, labels):
         """
@@ -199,7 +199,7 @@ def kfold_stratified_score(features, labels, clf, metrics, n_splits=4,
         logging.info("Training clf...")
         clf.fit(features_train, labels_train)
         t2 = time.process_time()
-        logging.info("Processing time: {:.3f}".format(t2 - t1))
+        logging.info("Processing time: %.3f", t2 - t1)
 
         # Labels predicted for test split
         labels_pred_test = clf.predict(features_test).reshape(-1)
@@ -291,7 +291,7 @@ def temporal_kfold_score(features, labels, clf, metrics, n_splits=4):
             print("Training clf...")
             clf.fit(features_train, labels_train)
             t2 = time.process_time()
-            logging.info("Processing time: {:.3f}".format(t2 - t1))
+            logging.info("Processing time: %.3f", t2 - t1)
             print("Processing time: {:.3f}".format(t2 - t1))
             # Labels predicted for test split
             labels_pred_test = clf.predict(features_test)
@@ -1,11 +1,14 @@
 import random
+from contextlib import contextmanager
 from deap import creator, base, tools
+from joblib import Parallel, delayed
+from joblib.externals.loky import get_reusable_executor
 import numpy as np
 from mloptimizer.hyperparams import HyperparameterSpace
 
 
 class DeapOptimizer:
-    def __init__(self, hyperparam_space: HyperparameterSpace = None, use_parallel=False,  seed=None):
+    def __init__(self, hyperparam_space: HyperparameterSpace = None, use_parallel=False, n_jobs=-1, seed=None):
         """
         Class to start the parameters for the use of DEAP library.
 
@@ -15,6 +18,8 @@ class DeapOptimizer:
             hyperparameter space
         use_parallel : bool
             flag to use parallel processing
+        n_jobs : int
+            number of workers used when use_parallel is True (-1 means all cores)
         seed : int
             seed for the random functions
 
@@ -24,12 +29,14 @@ class DeapOptimizer:
             hyperparameter space
         use_parallel : bool
             flag to use parallel processing
+        n_jobs : int
+            number of workers used when use_parallel is True
         seed : int
             seed for the random functions
         toolbox : deap.base.Toolbox
             toolbox for the optimization
         eval_dict : dict
-            dictionary with the evaluation of the individuals
+            dictionary with the evaluation of the individuals, tuple(individual) -> fitness values
         logbook : list
             list of logbook
         stats : deap.tools.Statistics
@@ -37,7 +44,18 @@ class DeapOptimizer:
         """
         self.hyperparam_space = hyperparam_space
         self.use_parallel = use_parallel
+        self.n_jobs = n_jobs
         self.seed = seed
+        # Names and bounds of the evolvable hyperparams, in gene order
+        self._hp_keys = list(self.hyperparam_space.evolvable_hyperparams)
+        self._hp_list = list(self.hyperparam_space.evolvable_hyperparams.values())
+        self._hp_low = np.array([h.min_value for h in self._hp_list])
+        self._hp_high = np.array([h.max_value for h in self._hp_list])
+        self._hp_low_tuple = tuple(self._hp_low.tolist())
+        self._hp_high_tuple = tuple(self._hp_high.tolist())
+        # Individuals are initialized with a local generator. DEAP operators use the global `random`
+        # and evaluations without random_state the global numpy generator, both seeded here
+        self._nprng = np.random.default_rng(seed)
         random.seed(seed)
         np.random.seed(seed)
 
@@ -61,12 +79,7 @@ class DeapOptimizer:
         ind : individual
             individual
         """
-        ps = []
-        for k in self.hyperparam_space.evolvable_hyperparams.keys():
-            ps.append(random.randint(self.hyperparam_space.evolvable_hyperparams[k].min_value,
-                                     self.hyperparam_space.evolvable_hyperparams[k].max_value)
-                      )
-        individual_initialized = pcls(ps)
+        individual_initialized = pcls(self._nprng.integers(self._hp_low, self._hp_high + 1).tolist())
         return individual_initialized
 
     def individual2dict(self, individual):
@@ -83,11 +96,9 @@ class DeapOptimizer:
         individual_dict : dict
             dictionary of hyperparams
         """
-        individual_dict = {}
-        keys = list(self.hyperparam_space.evolvable_hyperparams.keys())
-        for i in range(len(keys)):
-            individual_dict[keys[i]] = self.hyperparam_space.evolvable_hyperparams[keys[i]].correct(individual[i])
-        return {**individual_dict, **self.hyperparam_space.fixed_hyperparams}
+        individual_dict = {k: h.correct(v) for k, h, v in zip(self._hp_keys, self._hp_list, individual)}
+        individual_dict.update(self.hyperparam_space.fixed_hyperparams)
+        return individual_dict
 
     def setup(self):
         """
@@ -98,21 +109,38 @@ class DeapOptimizer:
         self.stats.register("min", np.min)
         self.stats.register("max", np.max)
         start_gen = 0
-        # Using deap, custom for decision tree
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
-
-        # Parallel https://deap.readthedocs.io/en/master/tutorials/basic/part4.html
-        if self.use_parallel:
-            try:
-                #from scoop import futures
-                import multiprocessing
-                pool = multiprocessing.Pool()
-                self.toolbox.register("map", pool.map)
-            except ImportError as e:
-                # self.optimization_logger.warning("Multiprocessing not available: {}".format(e))
-                # self.tracker.optimization_logger.warning("Multiprocessing not available: {}".format(e))
-                print("Multiprocessing not available: {}".format(e))
+        # Using deap, custom for decision tree (classes in creator are global, created only once)
+        if not hasattr(creator, "FitnessMax"):
+            creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+        if not hasattr(creator, "Individual"):
+            creator.create("Individual", list, fitness=creator.FitnessMax)
 
         self.toolbox.register("individual", self.init_individual, creator.Individual)
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
+
+    @contextmanager
+    def parallel_map(self):
+        """
+        Context manager that registers a parallel `map` in the toolbox when use_parallel is True.
+        A single pool of loky workers is kept alive for the whole context, so it is reused
+        across generations. On exit the workers are shut down explicitly, joblib would otherwise
+        keep them alive to reuse them in later calls.
+        More info on `deap parallelization <https://deap.readthedocs.io/en/master/tutorials/basic/part4.html>`__
+
+        Yields
+        ------
+        parallel : joblib.Parallel or None
+            the parallel executor, None if use_parallel is False
+        """
+        if not self.use_parallel:
+            yield None
+            return
+        try:
+            with Parallel(n_jobs=self.n_jobs, backend="loky") as parallel:
+                self.toolbox.register("map", lambda f, it: parallel(delayed(f)(x) for x in it))
+                try:
+                    yield parallel
+                finally:
+                    self.toolbox.register("map", map)
+        finally:
+            get_reusable_executor().shutdown(wait=True)
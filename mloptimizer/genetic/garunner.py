@@ -1,19 +1,75 @@
 import deap.base
-from deap.algorithms import eaSimple, varAnd
+from deap.algorithms import eaSimple
 from deap import tools
-from matplotlib import pyplot as plt
 
 from mloptimizer.aux.plots import plotly_search_space, plotly_logbook
 from mloptimizer.genetic import DeapOptimizer
 from mloptimizer.aux import Tracker
+import io
 import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import joblib
 import pandas as pd
 
 
+def _var_and_in_place(population, offspring, toolbox, cxpb, mutpb):
+    """
+    Same variation as ~deap.algorithms.varAnd, but the offspring are copied into the given
+    individuals instead of clones, so they can be reused across generations.
+    The random numbers are drawn in the same order as in varAnd.
+
+    Parameters
+    ----------
+    population : list
+        individuals to vary, they are not modified
+    offspring : list
+        individuals, as many as in population, where the offspring are stored
+    toolbox : ~deap.base.Toolbox
+        toolbox with the mate and mutate operators
+    cxpb : float
+        probability of mating two individuals
+    mutpb : float
+        probability of mutating an individual
+
+    Returns
+    -------
+    offspring : list
+        the offspring
+    """
+    for child, parent in zip(offspring, population):
+        child[:] = parent
+        if parent.fitness.valid:
+            child.fitness.values = parent.fitness.values
+        else:
+            del child.fitness.values
+        if hasattr(parent, "history_index"):
+            child.history_index = parent.history_index
+
+    for i in range(1, len(offspring), 2):
+        if random.random() < cxpb:
+            offspring[i - 1], offspring[i] = toolbox.mate(offspring[i - 1], offspring[i])
+            del offspring[i - 1].fitness.values, offspring[i].fitness.values
+
+    for i in range(len(offspring)):
+        if random.random() < mutpb:
+            offspring[i], = toolbox.mutate(offspring[i])
+            del offspring[i].fitness.values
+
+    return offspring
+
+
+def _write_checkpoint(data, cp_file, old_cp_file=None):
+    with open(cp_file, "wb") as f:
+        f.write(data)
+    if old_cp_file is not None and os.path.exists(old_cp_file):
+        os.remove(old_cp_file)
+
+
 class GeneticAlgorithmRunner:
     def __init__(self, deap_optimizer: DeapOptimizer, tracker: Tracker,
-                 seed, evaluator):
+                 seed, evaluator, eval_cache_size: int = 10000):
         """
         Class to run the genetic algorithm
 
@@ -27,6 +83,9 @@ class GeneticAlgorithmRunner:
             tracker
         seed : int
             seed for the random functions
+        eval_cache_size : int
+            maximum number of genotypes whose fitness (and hyperparams) are memoized
+            (least recently used are dropped)
 
         Attributes
         ----------
@@ -40,6 +99,8 @@ class GeneticAlgorithmRunner:
             toolbox
         seed : int
             seed for the random functions
+        eval_cache_size : int
+            maximum number of genotypes whose fitness is memoized
         """
         self.populations = []
         self.tracker = tracker
@@ -49,6 +110,13 @@ class GeneticAlgorithmRunner:
         self.evaluator = evaluator
         self.toolbox.register("evaluate", self.evaluator.evaluate_individual)
         self.seed = seed
+        self.eval_cache_size = eval_cache_size
+        # Fitness memoized by genotype, tuple(individual) -> fitness values
+        self.deap_optimizer.eval_dict = OrderedDict()
+        # Hyperparams by genotype, tuple(individual) -> dict of hyperparams, bounded like the fitness cache
+        self._params_dict = OrderedDict()
+        # Background rendering of the graphics of the last run
+        self._plot_future = None
 
     def simple_run(self, population_size: int, n_generations: int, cxpb: float = 0.5, mutation_prob: float = 0.5,
                    n_elites: int = 10, tournsize: int = 3, indpb: float = 0.05):
@@ -91,7 +159,8 @@ class GeneticAlgorithmRunner:
         return population, logbook, hof
 
     def run(self, population_size: int, n_generations: int, cxpb: float = 0.5, mutation_prob: float = 0.5,
-            n_elites: int = 10, tournsize: int = 3, indpb: float = 0.05, checkpoint: str = None) -> object:
+            n_elites: int = 10, tournsize: int = 3, indpb: float = 0.05, checkpoint: str = None,
+            write_every: int = 0) -> object:
         """
         Method to run the genetic algorithm. This uses the custom_ea_simple method.
         It allows to track what happens in each generation.
@@ -114,6 +183,8 @@ class GeneticAlgorithmRunner:
             probability of a gene to be mutated
         checkpoint : str
             path to the checkpoint file
+        write_every : int
+            write the population and logbook files every `write_every` generations (0 means only at the end)
 
         Returns
         -------
@@ -131,21 +202,61 @@ class GeneticAlgorithmRunner:
                                                          mutpb=mutation_prob,
                                                          ngen=n_generations, halloffame=hof, verbose=True,
                                                          checkpoint_path=self.tracker.opt_run_checkpoint_path,
-                                                         stats=self.deap_optimizer.stats)
+                                                         stats=self.deap_optimizer.stats,
+                                                         write_every=write_every)
+
+        # The graphics are rendered in the background, see wait_for_plots
+        plot_executor = ThreadPoolExecutor(max_workers=1)
+        self._plot_future = plot_executor.submit(self._render_plots, self.population_2_df(), logbook,
+                                                 self.tracker.graphics_path)
+        self._plot_future.add_done_callback(self._log_plot_error)
+        plot_executor.shutdown(wait=False)
+
+        return population, logbook, hof
 
+    def _render_plots(self, population_df, logbook, graphics_path):
+        """
+        Method to write the search space and logbook graphics of the optimization
+
+        Parameters
+        ----------
+        population_df : pandas dataframe
+            dataframe with the populations
+        logbook : ~deap.tools.Logbook
+            logbook of the optimization
+        graphics_path : str
+            folder where the graphics are written
+        """
         hyperparam_names = list(self.deap_optimizer.hyperparam_space.evolvable_hyperparams.keys())
         hyperparam_names.append("fitness")
-        population_df = self.population_2_df()
         df = population_df[hyperparam_names]
         g = plotly_search_space(df)
-        g.write_html(os.path.join(self.tracker.graphics_path, "search_space.html"))
-        plt.close()
+        g.write_html(os.path.join(graphics_path, "search_space.html"))
 
         g2 = plotly_logbook(logbook, population_df)
-        g2.write_html(os.path.join(self.tracker.graphics_path, "logbook.html"))
-        plt.close()
+        g2.write_html(os.path.join(graphics_path, "logbook.html"))
 
-        return population, logbook, hof
+    def _log_plot_error(self, future):
+        """
+        Callback to log the error raised while rendering the graphics, if any
+
+        Parameters
+        ----------
+        future : ~concurrent.futures.Future
+            future of the rendering of the graphics
+        """
+        error = future.exception()
+        if error is not None:
+            self.tracker.optimization_logger.error("Error writing the graphics: %s", error,
+                                                   exc_info=(type(error), error, error.__traceback__))
+
+    def wait_for_plots(self):
+        """
+        Method to wait until the graphics of the last run are written.
+        Errors raised while rendering them are raised here.
+        """
+        if self._plot_future is not None:
+            self._plot_future.result()
 
     def _pre_run(self, indpb: float = 0.5, n_elites: int = 10,
                  population_size: int = 10, tournsize: int = 4):
@@ -178,8 +289,8 @@ class GeneticAlgorithmRunner:
         self.toolbox.register("mate", tools.cxTwoPoint)
         self.toolbox.register(
             "mutate", tools.mutUniformInt,
-            low=[x.min_value for x in self.deap_optimizer.hyperparam_space.evolvable_hyperparams.values()],
-            up=[x.max_value for x in self.deap_optimizer.hyperparam_space.evolvable_hyperparams.values()],
+            low=self.deap_optimizer._hp_low_tuple,
+            up=self.deap_optimizer._hp_high_tuple,
             indpb=indpb
         )
         self.toolbox.register("select", tools.selTournament, tournsize=tournsize)
@@ -195,13 +306,13 @@ class GeneticAlgorithmRunner:
                          checkpoint_path: str = None,
                          stats: deap.tools.Statistics = None,
                          halloffame: deap.tools.HallOfFame = None, verbose: bool = True,
-                         checkpoint_flag: bool = True):
+                         checkpoint_flag: bool = True, write_every: int = 0):
         """
         This algorithm reproduces the simplest evolutionary algorithm as
         presented in chapter 7 of [Back2000]_.
 
         The code is close to the ~deap.algorithms.eaSimple method, but it has been modified to track
-        the progress of the optimization and to save the population and the logbook in each generation.
+        the progress of the optimization and to save the population and the logbook.
         More info can be found
         `on deap documentation <https://deap.readthedocs.io/en/master/_modules/deap/algorithms.html#eaSimple>`__
 
@@ -229,6 +340,9 @@ class GeneticAlgorithmRunner:
             Whether or not to log the statistics.
         checkpoint_flag : bool
             Whether or not to save the checkpoint.
+        write_every : int
+            Write the population and logbook files every `write_every` generations.
+            They are always written at the end; 0 means only at the end.
 
         Returns
         -------
@@ -254,57 +368,126 @@ class GeneticAlgorithmRunner:
             self.tracker.optimization_logger.error(error_msg)
             raise NotADirectoryError(error_msg)
 
+        eval_dict = self.deap_optimizer.eval_dict
+
+        # Two sets of individuals reused by turns to store the offspring of each generation
+        offspring_pools = [[toolbox.clone(ind) for ind in population] for _ in range(2)]
+
+        # Checkpoints are written in the background, only the latest two are kept
+        cp_executor = ThreadPoolExecutor(max_workers=1)
+        cp_futures = []
+
         # Begin the generational process
         # import multiprocessing
         # pool = multiprocessing.Pool()
         # toolbox.register("map", pool.map)
-        for gen in range(start_gen, ngen + 1):
-            self.tracker.start_progress_file(gen)
-
-            # Vary the pool of individuals
-            population = varAnd(population, toolbox, cxpb, mutpb)
-
-            # Evaluate the individuals with an invalid fitness
-            invalid_ind = [ind for ind in population if not ind.fitness.valid]
-            fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
-            c = 1
-            evaluations_pending = len(invalid_ind)
-            for ind, fit in zip(invalid_ind, fitnesses):
-                ind.fitness.values = fit
-                ind_formatted = self.deap_optimizer.individual2dict(ind)
-                self.tracker.append_progress_file(gen, c, evaluations_pending, ind_formatted, fit)
-
-                c = c + 1
-
-            halloffame.update(population)
-
-            record = stats.compile(population) if stats else {}
-
-            logbook.record(gen=gen, nevals=len(invalid_ind), **record)
-            if verbose:
-                self.tracker.optimization_logger.info(logbook.stream)
+        try:
+            for gen in range(start_gen, ngen + 1):
+                self.tracker.start_progress_file(gen)
+
+                # Vary the pool of individuals
+                population = _var_and_in_place(population, offspring_pools[gen % 2], toolbox, cxpb, mutpb)
+
+                # Evaluate the individuals with an invalid fitness
+                invalid_ind = [ind for ind in population if not ind.fitness.valid]
+                # Genotypes already evaluated take their fitness from the cache,
+                # the rest are evaluated once even if repeated in the population
+                to_eval = {}
+                for ind in invalid_ind:
+                    key = tuple(ind)
+                    if key in eval_dict:
+                        eval_dict.move_to_end(key)
+                        ind.fitness.values = eval_dict[key]
+                    else:
+                        to_eval.setdefault(key, []).append(ind)
+                fitnesses = toolbox.map(toolbox.evaluate, [inds[0] for inds in to_eval.values()])
+                c = 1
+                evaluations_pending = len(to_eval)
+                for (key, inds), fit in zip(to_eval.items(), fitnesses):
+                    for ind in inds:
+                        ind.fitness.values = fit
+                    eval_dict[key] = fit
+                    if len(eval_dict) > self.eval_cache_size:
+                        eval_dict.popitem(last=False)
+                    ind_formatted = self._individual_params(inds[0])
+                    self.tracker.append_progress_file(gen, c, evaluations_pending, ind_formatted, fit)
+
+                    c = c + 1
+                self.tracker.end_progress_file(gen)
+
+                # Once the hall of fame is full only individuals better than its worst one can enter
+                if 0 < halloffame.maxsize <= len(halloffame):
+                    worst_fitness = halloffame[-1].fitness
+                    halloffame.update([ind for ind in population if ind.fitness > worst_fitness])
+                else:
+                    halloffame.update(population)
+
+                record = stats.compile(population) if stats else {}
+
+                logbook.record(gen=gen, nevals=len(to_eval), **record)
+                if verbose:
+                    self.tracker.optimization_logger.info(logbook.stream)
+
+                # Select the next generation individuals
+                population = toolbox.select(population, len(population))
+
+                # halloffame_classifiers = list(map(self.get_clf, halloffame[:2]))
+                # halloffame_fitness = [ind.fitness.values[:] for ind in halloffame[:2]]
+                # self.tracker.log_clfs(classifiers_list=halloffame_classifiers, generation=gen,
+                #                      fitness_list=halloffame_fitness)
+                # Store the space hyperparams and fitness for each individual
+                # (a copy, the individuals are reused in the next generations)
+                self.populations.append([[tuple(ind), ind.fitness.values] for ind in population])
+
+                if checkpoint_flag:
+                    # Fill the dictionary using the dict(key=value[, ...]) constructor
+                    cp = dict(population=population, generation=gen, halloffame=halloffame,
+                              logbook=logbook, rndstate=self.seed)
+
+                    cp_file = os.path.join(checkpoint_path, "cp_gen_{}.pkl".format(gen))
+                    old_cp_file = os.path.join(checkpoint_path, "cp_gen_{}.pkl".format(gen - 2))
+                    # Serialized here, the objects keep changing in the next generations
+                    cp_buffer = io.BytesIO()
+                    joblib.dump(cp, cp_buffer)
+                    cp_futures.append(cp_executor.submit(_write_checkpoint, cp_buffer.getvalue(), cp_file, old_cp_file))
+                if write_every and gen % write_every == 0:
+                    self.tracker.write_population_file(self.population_2_df())
+                    self.tracker.write_logbook_file(logbook)
+        finally:
+            # Pending checkpoints are written even if the generational process fails
+            cp_executor.shutdown(wait=True)
+        for future in cp_futures:
+            future.result()
+        self.tracker.write_population_file(self.population_2_df())
+        self.tracker.write_logbook_file(logbook)
 
-            # Select the next generation individuals
-            population = toolbox.select(population, len(population))
-
-            # halloffame_classifiers = list(map(self.get_clf, halloffame[:2]))
-            # halloffame_fitness = [ind.fitness.values[:] for ind in halloffame[:2]]
-            # self.tracker.log_clfs(classifiers_list=halloffame_classifiers, generation=gen,
-            #                      fitness_list=halloffame_fitness)
-            # Store the space hyperparams and fitness for each individual
-            self.populations.append([[ind, ind.fitness] for ind in population])
+        return population, logbook, halloffame
 
-            if checkpoint_flag:
-                # Fill the dictionary using the dict(key=value[, ...]) constructor
-                cp = dict(population=population, generation=gen, halloffame=halloffame,
-                          logbook=logbook, rndstate=self.seed)
+    def _individual_params(self, individual):
+        """
+        Method to get the hyperparams of an individual, converted only once per genotype
+        while it is among the eval_cache_size most recently used ones
 
-                cp_file = os.path.join(checkpoint_path, "cp_gen_{}.pkl".format(gen))
-                joblib.dump(cp, cp_file)
-            self.tracker.write_population_file(self.population_2_df())
-            self.tracker.write_logbook_file(logbook)
+        Parameters
+        ----------
+        individual : individual
+            individual to convert
 
-        return population, logbook, halloffame
+        Returns
+        -------
+        params : dict
+            dictionary of hyperparams (shared, must not be modified)
+        """
+        key = tuple(individual)
+        params = self._params_dict.get(key)
+        if params is None:
+            params = self.deap_optimizer.individual2dict(individual)
+            self._params_dict[key] = params
+            if len(self._params_dict) > self.eval_cache_size:
+                self._params_dict.popitem(last=False)
+        else:
+            self._params_dict.move_to_end(key)
+        return params
 
     def population_2_df(self):
         """
@@ -319,8 +502,8 @@ class GeneticAlgorithmRunner:
         n = 0
         for p in self.populations:
             for i in p:
-                i_hyperparams = self.deap_optimizer.individual2dict(i[0])
-                i_hyperparams['fitness'] = i[1].values[0]
+                i_hyperparams = dict(self._individual_params(i[0]))
+                i_hyperparams['fitness'] = i[1][0]
                 i_hyperparams['population'] = n
                 data.append(i_hyperparams)
             n += 1
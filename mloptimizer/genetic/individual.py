@@ -6,6 +6,9 @@ class IndividualUtils:
         self.hyperparam_space = hyperparam_space
         self.estimator_class = estimator_class
         self.mlopt_seed = mlopt_seed
+        # Names and definitions of the evolvable hyperparams, in gene order
+        self._hp_keys = list(hyperparam_space.evolvable_hyperparams) if hyperparam_space is not None else []
+        self._hp_list = list(hyperparam_space.evolvable_hyperparams.values()) if hyperparam_space is not None else []
 
     def get_clf(self, individual):
         individual_dict = self.individual2dict(individual)
@@ -26,8 +29,6 @@ class IndividualUtils:
         individual_dict : dict
             dictionary of hyperparams
         """
-        individual_dict = {}
-        keys = list(self.hyperparam_space.evolvable_hyperparams.keys())
-        for i in range(len(keys)):
-            individual_dict[keys[i]] = self.hyperparam_space.evolvable_hyperparams[keys[i]].correct(individual[i])
-        return {**individual_dict, **self.hyperparam_space.fixed_hyperparams}
+        individual_dict = {k: h.correct(v) for k, h, v in zip(self._hp_keys, self._hp_list, individual)}
+        individual_dict.update(self.hyperparam_space.fixed_hyperparams)
+        return individual_dict
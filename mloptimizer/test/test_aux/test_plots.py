@@ -6,7 +6,7 @@ from sklearn.tree import DecisionTreeClassifier
 from sklearn.datasets import load_iris
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def default_tree_optimizer():
     X, y = load_iris(return_X_y=True)
     default_hyperparameter_space = HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier)
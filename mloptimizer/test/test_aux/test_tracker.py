@@ -0,0 +1,32 @@
+import os
+import pandas as pd
+from deap import tools
+from mloptimizer.aux import Tracker
+
+
+def _logbook(n_records, offset=0.0):
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals', 'avg', 'min', 'max']
+    for gen in range(n_records):
+        logbook.record(gen=gen, nevals=10, avg=0.5 + gen / 10 + offset, min=0.1 + offset, max=0.9 + offset)
+    return logbook
+
+
+def test_write_logbook_file(tmp_path):
+    tracker = Tracker(name="test", folder=str(tmp_path))
+    filename = os.path.join(tmp_path, "logbook.csv")
+    expected_filename = os.path.join(tmp_path, "expected.csv")
+
+    # The same logbook growing between writes
+    logbook = _logbook(2)
+    tracker.write_logbook_file(logbook, filename)
+    logbook.record(gen=2, nevals=8, avg=0.75, min=0.2, max=0.95)
+    tracker.write_logbook_file(logbook, filename)
+    pd.DataFrame(logbook).to_csv(expected_filename, index=False)
+    pd.testing.assert_frame_equal(pd.read_csv(filename), pd.read_csv(expected_filename))
+
+    # A different logbook written to the same file replaces it
+    other_logbook = _logbook(4, offset=0.01)
+    tracker.write_logbook_file(other_logbook, filename)
+    pd.DataFrame(other_logbook).to_csv(expected_filename, index=False)
+    pd.testing.assert_frame_equal(pd.read_csv(filename), pd.read_csv(expected_filename))
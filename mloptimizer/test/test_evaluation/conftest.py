@@ -0,0 +1,9 @@
+import pytest
+from sklearn.datasets import make_classification
+
+
+@pytest.fixture
+def classification_mock_data():
+    # Create mock features and labels for classification testing
+    features, labels = make_classification(n_samples=100, n_features=10, n_classes=2, random_state=42)
+    return features, labels
@@ -0,0 +1,35 @@
+from mloptimizer.evaluation import Evaluator, train_score
+import pickle
+import numpy as np
+
+
+def test_shared_data_pickle(classification_mock_data):
+    features, labels = classification_mock_data
+    evaluator = Evaluator(features=features, labels=labels, eval_function=train_score)
+    with evaluator.shared_data():
+        pickled = pickle.dumps(evaluator)
+        assert len(pickled) < features.nbytes
+        evaluator_copy = pickle.loads(pickled)
+        np.testing.assert_array_equal(evaluator_copy.features, features)
+        np.testing.assert_array_equal(evaluator_copy.labels, labels)
+        del evaluator_copy
+    assert evaluator._shared_data == {}
+    assert len(pickle.dumps(evaluator)) > features.nbytes
+
+
+def _attached_runs(evaluator):
+    from mloptimizer.evaluation import evaluator as evaluator_module
+    return float(evaluator.features.sum()), len(evaluator_module._attached_shared_memory)
+
+
+def test_shared_data_workers(classification_mock_data):
+    from joblib import Parallel, delayed
+    features, labels = classification_mock_data
+    evaluator = Evaluator(features=features, labels=labels, eval_function=train_score)
+    with Parallel(n_jobs=2, backend="loky") as parallel:
+        for _ in range(2):
+            with evaluator.shared_data():
+                results = parallel(delayed(_attached_runs)(evaluator) for _ in range(4))
+            # Workers only keep the blocks of the current run
+            assert all(n_runs == 1 for _, n_runs in results)
+            assert all(total == features.sum() for total, _ in results)
@@ -9,7 +9,10 @@ from sklearn.svm import SVC
 from mloptimizer.evaluation import kfold_score, train_score, train_test_score
 import time
 import os
+import random
+import numpy as np
 from sklearn.metrics import accuracy_score
+from scipy.sparse import csr_matrix
 
 custom_evolvable_hyperparams = {
     "min_samples_split": Hyperparam("min_samples_split", 2, 50, 'int'),
@@ -152,3 +155,91 @@ def test_reproducibility(estimator_class, target_score, default_metrics_dict):
     result3 = optimizer3.optimize_clf(population_size=population, generations=generations)
     assert str(result1) == str(result2)
     assert str(result1) != str(result3)
+
+
+def test_fitness_memoization():
+    X, y = load_iris(return_X_y=True)
+    opt = Optimizer(features=X, labels=y, estimator_class=DecisionTreeClassifier,
+                    hyperparam_space=HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier))
+    opt.optimize_clf(10, 5)
+    # Each distinct genotype is evaluated only once
+    eval_dict = opt.runs[-1].deap_optimizer.eval_dict
+    assert sum(opt.logbook.select("nevals")) == len(eval_dict)
+
+
+def test_features_dtype():
+    X, y = load_iris(return_X_y=True)
+    opt = Optimizer(features=X, labels=y, estimator_class=DecisionTreeClassifier,
+                    hyperparam_space=HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier),
+                    features_dtype=np.float32)
+    assert opt.features.dtype == np.float32
+    assert opt.evaluator.features.dtype == np.float32
+    opt.optimize_clf(2, 2)
+
+
+def test_sparse_features():
+    X, y = load_iris(return_X_y=True)
+    X_sparse = csr_matrix(X)
+    opt = Optimizer(features=X_sparse, labels=y, estimator_class=DecisionTreeClassifier,
+                    hyperparam_space=HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier))
+    assert opt.features is X_sparse
+    clf = opt.optimize_clf(2, 2)
+    assert clf is not None
+
+
+def test_wait_for_plots():
+    X, y = load_iris(return_X_y=True)
+    opt = Optimizer(features=X, labels=y, estimator_class=DecisionTreeClassifier,
+                    hyperparam_space=HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier))
+    opt.optimize_clf(2, 2)
+    opt.wait_for_plots()
+    assert os.path.isfile(os.path.join(opt.tracker.graphics_path, "search_space.html"))
+    assert os.path.isfile(os.path.join(opt.tracker.graphics_path, "logbook.html"))
+
+
+def test_checkpoints_rotation():
+    X, y = load_iris(return_X_y=True)
+    opt = Optimizer(features=X, labels=y, estimator_class=DecisionTreeClassifier,
+                    hyperparam_space=HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier))
+    opt.optimize_clf(5, 5)
+    # Only the latest two checkpoints are kept
+    assert sorted(os.listdir(opt.tracker.opt_run_checkpoint_path)) == ["cp_gen_4.pkl", "cp_gen_5.pkl"]
+
+
+@pytest.mark.parametrize('write_every', (0, 2))
+def test_write_every(write_every):
+    X, y = load_iris(return_X_y=True)
+    files_written = []
+
+    def recording_score(features, labels, clf, metrics):
+        # Records if the results files exist while the optimization is running
+        results_path = opt.tracker.results_path
+        files_written.append(os.path.isfile(os.path.join(results_path, "populations.csv")) and
+                             os.path.isfile(os.path.join(results_path, "logbook.csv")))
+        return train_score(features, labels, clf, metrics)
+
+    opt = Optimizer(features=X, labels=y, estimator_class=DecisionTreeClassifier, eval_function=recording_score,
+                    hyperparam_space=HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier))
+    opt.optimize_clf(5, 5, write_every=write_every)
+    assert any(files_written) == bool(write_every)
+    # The files are always written at the end
+    assert os.path.isfile(os.path.join(opt.tracker.results_path, "populations.csv"))
+    assert os.path.isfile(os.path.join(opt.tracker.results_path, "logbook.csv"))
+
+
+def test_reproducibility_other_optimizers():
+    X, y = load_iris(return_X_y=True)
+    hyperparam_space = HyperparameterSpace.get_default_hyperparameter_space(DecisionTreeClassifier)
+    seed = 25
+    optimizer1 = Optimizer(features=X, labels=y, seed=seed, estimator_class=DecisionTreeClassifier,
+                           hyperparam_space=hyperparam_space)
+    result1 = optimizer1.optimize_clf(population_size=5, generations=3)
+    # Other optimizers are created and random numbers drawn before running the optimizer
+    optimizer2 = Optimizer(features=X, labels=y, seed=seed, estimator_class=DecisionTreeClassifier,
+                           hyperparam_space=hyperparam_space)
+    Optimizer(features=X, labels=y, seed=3, estimator_class=DecisionTreeClassifier,
+              hyperparam_space=hyperparam_space)
+    random.random()
+    np.random.rand()
+    result2 = optimizer2.optimize_clf(population_size=5, generations=3)
+    assert str(result1) == str(result2)
@@ -0,0 +1,48 @@
+import random
+import pytest
+from deap import base, creator, tools
+from deap.algorithms import varAnd
+from mloptimizer.genetic.garunner import _var_and_in_place
+
+
+@pytest.fixture
+def toolbox():
+    if not hasattr(creator, "FitnessMax"):
+        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+    if not hasattr(creator, "Individual"):
+        creator.create("Individual", list, fitness=creator.FitnessMax)
+    toolbox = base.Toolbox()
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", tools.mutUniformInt, low=0, up=20, indpb=0.5)
+    return toolbox
+
+
+@pytest.mark.parametrize('population_size', (1, 7, 10))
+@pytest.mark.parametrize('seed', (0, 1, 2))
+def test_var_and_in_place(toolbox, population_size, seed):
+    random.seed(seed)
+    parents = [creator.Individual(random.randint(0, 20) for _ in range(6)) for _ in range(4)]
+    for i, parent in enumerate(parents[:2]):
+        parent.fitness.values = (i / 10,)
+    # Selection returns repeated parents
+    population = [parents[i % len(parents)] for i in range(population_size)]
+    parents_before = [(list(ind), ind.fitness.valid, ind.fitness.values) for ind in parents]
+
+    random.seed(seed)
+    expected = varAnd(population, toolbox, 0.6, 0.4)
+    # The offspring pool has stale genes and fitness from a previous generation
+    pool = [creator.Individual([0] * 6) for _ in range(population_size)]
+    for ind in pool[::2]:
+        ind.fitness.values = (1.0,)
+    random.seed(seed)
+    offspring = _var_and_in_place(population, pool, toolbox, 0.6, 0.4)
+
+    assert [list(ind) for ind in offspring] == [list(ind) for ind in expected]
+    assert [ind.fitness.valid for ind in offspring] == [ind.fitness.valid for ind in expected]
+    assert [ind.fitness.values for ind in offspring if ind.fitness.valid] == \
+           [ind.fitness.values for ind in expected if ind.fitness.valid]
+    # The offspring are the pool individuals, none of them shared
+    assert all(child is slot for child, slot in zip(offspring, pool))
+    assert len({id(ind) for ind in offspring}) == len(offspring)
+    # Parents are not modified
+    assert [(list(ind), ind.fitness.valid, ind.fitness.values) for ind in parents] == parents_before